@@ -1,9 +1,16 @@
+import csv
+import os
 import tkinter as tk
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from tkinter import ttk
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import re  # For extracting the first 4 digits of the year
 
+_YEAR_RE = re.compile(r"(\d{4})")
+
 # ------------------------------ MEDIA & MOVIE CLASSES ------------------------------
 
 class Media:
@@ -11,6 +18,8 @@ class Media:
     Base class to represent a general piece of media.
     Demonstrates inheritance: Movie will inherit from Media.
     """
+    __slots__ = ("__title", "__year", "_title_lower")
+
     def __init__(self, title: str, year: int):
         # Enforce non-empty title using property setter; no range constraints on year.
         self.title = title
@@ -25,6 +34,8 @@ class Media:
         if not value:
             raise ValueError("Title cannot be empty.")
         self.__title = value
+        # Cached for case-insensitive lookups so callers don't re-lower on every scan.
+        self._title_lower = value.lower()
 
     @property
     def year(self):
@@ -40,12 +51,29 @@ class Movie(Media):
     A specialized Media that includes genre, rating, and watched status.
     Demonstrates encapsulation via private attributes and getters/setters.
     """
+    __slots__ = ("__genre", "__watched", "__rating")
+
     def __init__(self, title: str, year: int, genre: str, watched=False, rating=None):
         super().__init__(title, year)
         self.__genre = genre
-        self.__watched = watched
+        self.__watched = bool(watched)
         self.__rating = rating
 
+    @classmethod
+    def _unchecked(cls, title, year, genre, watched, rating):
+        """
+        Build a Movie from already-normalized values (e.g. typed CSV columns),
+        assigning the private attributes directly instead of going through the setters.
+        """
+        movie = cls.__new__(cls)
+        movie._Media__title = title
+        movie._Media__year = year
+        movie._title_lower = title.lower()
+        movie.__genre = genre
+        movie.__watched = watched
+        movie.__rating = rating
+        return movie
+
     @property
     def genre(self):
         return self.__genre
@@ -76,6 +104,52 @@ class Movie(Media):
 
 # ------------------------------ MOVIE LIBRARY CLASS ------------------------------
 
+CSV_COLUMNS = ["Title", "Year", "Genre", "Watched", "Rating"]
+
+# Column types for read_csv, so pandas doesn't have to infer them.
+# Watched is read as text and converted in load_from_csv so values like "yes" still load.
+_CSV_DTYPES = {"Year": "Int32", "Watched": "string", "Rating": "float64"}
+# Text columns go through a converter, which makes pandas hand over the raw field without
+# its default missing-value detection, so a title or genre such as "NA" is kept as written.
+_CSV_CONVERTERS = {"Title": str, "Genre": str}
+# Watched values read as False; anything else that isn't missing counts as watched.
+_FALSE_STRINGS = ["false", "no", "n", "0", "0.0"]
+
+
+def _csv_row(movie):
+    """Return the CSV fields for a movie, in CSV_COLUMNS order."""
+    return (movie.title, movie.year, movie.genre, movie.watched,
+            "" if movie.rating is None else movie.rating)
+
+
+def _is_appendable(filename):
+    """Return True if the CSV has exactly the CSV_COLUMNS header and ends with a newline."""
+    with open(filename, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            return False
+    return _read_header(filename) == CSV_COLUMNS
+
+
+def _read_header(filename):
+    """Return the first row of a CSV as a list of column names, or None if it is empty."""
+    with open(filename, newline="", encoding="utf-8", errors="replace") as f:
+        return next(csv.reader(f), None)
+
+
+def _column(df, name, default, n):
+    """
+    Return a CSV column as a plain list, or n copies of default if it is missing.
+    Missing values in the column are replaced by default as well.
+    """
+    if name not in df:
+        return [default] * n
+    column = df[name]
+    if default is None:
+        return column.astype(object).where(column.notna(), None).tolist()
+    return column.fillna(default).tolist()
+
+
 class MovieLibrary:
     """
     Holds multiple Movie objects (composition).
@@ -84,18 +158,29 @@ class MovieLibrary:
     def __init__(self):
         self.__movies = []
         self.__unwatched_movies = []
+        # Path of a CSV that failed to load; writing to it would replace rows we never read.
+        self.__unreadable_csv = None
+        # Path of the CSV whose every row and column the library holds, so it can be rewritten.
+        self.__synced_csv = None
 
     def add_movie(self, movie: Movie):
         """Adds a Movie object to the library."""
         self.__movies.append(movie)
+        if not movie.watched:
+            self.__unwatched_movies.append(movie)
+
+    def __bulk_add(self, movies):
+        """Adds many Movie objects at once, rebuilding the unwatched list a single time."""
+        self.__movies.extend(movies)
         self.__build_unwatched_list()
 
     def delete_movie_by_title(self, title_to_delete: str):
         """Delete movies matching the given title (case-insensitive)."""
+        key = title_to_delete.lower()
         before_count = len(self.__movies)
         self.__movies = [
             m for m in self.__movies
-            if m.title.lower() != title_to_delete.lower()
+            if m._title_lower != key
         ]
         after_count = len(self.__movies)
         self.__build_unwatched_list()
@@ -106,7 +191,11 @@ class MovieLibrary:
         return self.__movies
 
     def get_unwatched_movies(self):
-        """Return a list of unwatched Movie objects."""
+        """
+        Return a list of unwatched Movie objects.
+        The list is kept up to date on add and rebuilt on load and delete, so a movie
+        marked watched after being added stays in it until the next delete or load.
+        """
         return self.__unwatched_movies
 
     def __build_unwatched_list(self):
@@ -114,10 +203,13 @@ class MovieLibrary:
 
     def ensure_valid_ratings(self):
         """Checks and resets any invalid ratings using a while loop."""
+        movies = self.__movies
+        count = len(movies)
         i = 0
-        while i < len(self.__movies):
-            movie = self.__movies[i]
-            if movie.rating is not None and (movie.rating < 0 or movie.rating > 10):
+        while i < count:
+            movie = movies[i]
+            rating = movie.rating
+            if rating is not None and (rating < 0 or rating > 10):
                 movie.rating = None
             i += 1
 
@@ -126,41 +218,82 @@ class MovieLibrary:
     def load_from_csv(self, filename="movies.csv"):
         """Load movies from a CSV using pandas, converting rows to Movie objects."""
         try:
-            df = pd.read_csv(filename)
+            df = pd.read_csv(filename, engine="c", usecols=lambda c: c in CSV_COLUMNS,
+                             dtype=_CSV_DTYPES, converters=_CSV_CONVERTERS)
         except FileNotFoundError:
             print("No existing CSV found. Starting with an empty library.")
             return
+        except ValueError as e:
+            self.__unreadable_csv = os.path.abspath(filename)
+            print(f"Could not read {filename}: {e}. "
+                  "Starting with an empty library; changes will not be saved to that file.")
+            return
 
-        for _, row in df.iterrows():
-            title = row.get("Title", "")
-            year = int(row.get("Year", 2000))
-            genre = row.get("Genre", "")
-            watched = bool(row.get("Watched", False))
-            rating = row.get("Rating", None)
-            if pd.isnull(rating):
-                rating = None
-            else:
-                rating = float(rating)
-
-            try:
-                movie = Movie(title, year, genre, watched, rating)
-                self.add_movie(movie)
-            except ValueError as e:
-                print(f"Skipping invalid movie row: {e}")
+        if "Watched" in df:
+            watched = df["Watched"].str.strip().str.lower()
+            df["Watched"] = watched.notna() & ~watched.isin(_FALSE_STRINGS)
+
+        n = len(df)
+        # Sized up front from the row count; trimmed below if any rows are skipped.
+        movies = [None] * n
+        count = 0
+        titles = _column(df, "Title", "", n)
+        years = _column(df, "Year", 2000, n)
+        genres = _column(df, "Genre", "", n)
+        watched_flags = _column(df, "Watched", False, n)
+        ratings = _column(df, "Rating", None, n)
+
+        for title, year, genre, watched, rating in zip(titles, years, genres, watched_flags, ratings):
+            if not title:
+                print("Skipping invalid movie row: Title cannot be empty.")
+                continue
+            movies[count] = Movie._unchecked(title, year, genre, watched, rating)
+            count += 1
+
+        del movies[count:]
+        self.__bulk_add(movies)
+
+        if count == n and set(_read_header(filename) or []) <= set(CSV_COLUMNS):
+            self.__synced_csv = os.path.abspath(filename)
 
     def save_to_csv(self, filename="movies.csv"):
-        """Save current movies to a CSV via pandas."""
-        data = []
-        for m in self.__movies:
-            data.append({
-                "Title": m.title,
-                "Year": m.year,
-                "Genre": m.genre,
-                "Watched": m.watched,
-                "Rating": m.rating
-            })
-        df = pd.DataFrame(data)
-        df.to_csv(filename, index=False)
+        """Save current movies to a CSV, writing rows straight from the Movie objects."""
+        if self.__is_unreadable(filename):
+            return
+        with open(filename, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(CSV_COLUMNS)
+            writer.writerows(_csv_row(m) for m in self.__movies)
+        self.__synced_csv = os.path.abspath(filename)
+
+    def append_to_csv(self, movie: Movie, filename="movies.csv"):
+        """
+        Append a single movie (already added to the library) to the CSV without rewriting
+        the existing rows. If the file isn't in CSV_COLUMNS layout it is rewritten with
+        save_to_csv, but only when the library holds everything in it.
+        """
+        if self.__is_unreadable(filename):
+            return
+        if not os.path.exists(filename) or os.path.getsize(filename) == 0:
+            self.save_to_csv(filename)
+            return
+        if not _is_appendable(filename):
+            if self.__synced_csv != os.path.abspath(filename):
+                print(f"Not saving: {filename} is not in the expected layout and has rows "
+                      "or columns that were not loaded, so it cannot be rewritten safely.")
+                return
+            self.save_to_csv(filename)
+            return
+        with open(filename, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(_csv_row(movie))
+
+    def __is_unreadable(self, filename):
+        """Report and return True if filename is a CSV that failed to load."""
+        if self.__unreadable_csv != os.path.abspath(filename):
+            return False
+        print(f"Not saving: {filename} could not be read at startup. Fix or move it first.")
+        return True
 
 
 # ------------------------------ MOVIELOG APP CLASS ------------------------------
@@ -170,17 +303,37 @@ class MovieLogApp(tk.Tk):
     Main Tkinter application. Inherits from tk.Tk.
     Encapsulates the UI logic and composes a MovieLibrary instance.
     """
-    def __init__(self, api_key="YOUR_OMDB_API_KEY"):
+    def __init__(self, api_key="YOUR_OMDB_API_KEY", library=None):
         super().__init__()
         self.title("MovieLog")
         self.geometry("1000x500")  # Wider to accommodate the recommended section
 
-        self.library = MovieLibrary()
-        self.library.load_from_csv("movies.csv")
+        # Use a preloaded library when given; otherwise load it from the CSV here.
+        if library is None:
+            library = MovieLibrary()
+            library.load_from_csv("movies.csv")
+        self.library = library
         self.api_key = api_key
 
+        # One pooled session so repeated OMDb lookups reuse the same keep-alive connection.
+        self._http = requests.Session()
+        self._http.headers.update({"User-Agent": "MovieLog/1.0"})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4,
+                              max_retries=Retry(total=2, backoff_factor=0.2))
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+        # OMDb requests run here so the Tk event loop stays responsive while waiting.
+        self._pool = ThreadPoolExecutor(max_workers=2)
+        # Only the most recent fetch may fill the form; older results are dropped.
+        self._fetch_future = None
+
         self._setup_ui()
 
+    def destroy(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._http.close()
+        super().destroy()
+
     def _setup_ui(self):
         """Set up frames, widgets, and layout."""
         self.main_frame = ttk.Frame(self, padding=10)
@@ -253,9 +406,9 @@ class MovieLogApp(tk.Tk):
             Movie("The Dark Knight", 2008, "Action", watched=True, rating=9.0),
         ]
 
-        for movie in self.recommended_movies:
-            display_text = f"{movie.title} ({movie.year}) - Rating: {movie.rating}"
-            self.recommended_listbox.insert(tk.END, display_text)
+        # Listbox.insert accepts several items, so add them all in one call.
+        items = tuple(f"{m.title} ({m.year}) - Rating: {m.rating}" for m in self.recommended_movies)
+        self.recommended_listbox.insert(tk.END, *items)
 
         self.main_frame.columnconfigure(0, weight=3)
         self.main_frame.columnconfigure(1, weight=1)
@@ -270,15 +423,42 @@ class MovieLogApp(tk.Tk):
             print("Please enter a movie title first.")
             return
 
-        url = f"http://www.omdbapi.com/?apikey={self.api_key}&t={title}"
-        response = requests.get(url)
+        if self._fetch_future is not None:
+            self._fetch_future.cancel()
+        future = self._pool.submit(self._http.get, "http://www.omdbapi.com/", timeout=5,
+                                   params={"apikey": self.api_key, "t": title})
+        self._fetch_future = future
+        self.after(50, self._poll_fetch, future)
 
+    def _poll_fetch(self, future):
+        """Wait for a background fetch without blocking, then apply it on the Tk thread."""
+        if future is not self._fetch_future:
+            return
+        if not future.done():
+            self.after(50, self._poll_fetch, future)
+            return
+        self._fetch_future = None
+        try:
+            response = future.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            print("Network error:", e)
+            return
+        self._apply_fetch(response)
+
+    def _apply_fetch(self, response):
+        """Fill the form fields from an OMDb response."""
         if response.status_code == 200:
             data = response.json()
             if data.get("Response") == "True":
                 omdb_year = data.get("Year", "")
-                match = re.match(r"(\d{4})", omdb_year)
-                omdb_year = match.group(1) if match else ""
+                prefix = omdb_year[:4]
+                if len(prefix) == 4 and prefix.isascii() and prefix.isdigit():
+                    omdb_year = prefix
+                else:
+                    match = _YEAR_RE.match(omdb_year)
+                    omdb_year = match.group(1) if match else ""
 
                 self.entry_title.delete(0, tk.END)
                 self.entry_title.insert(0, data.get("Title", ""))
@@ -328,7 +508,7 @@ class MovieLogApp(tk.Tk):
         try:
             movie = Movie(title, year, genre, watched, rating)
             self.library.add_movie(movie)
-            self.library.save_to_csv("movies.csv")
+            self.library.append_to_csv(movie, "movies.csv")
         except ValueError as e:
             print("Error adding movie:", e)
             return
@@ -357,13 +537,17 @@ class MovieLogApp(tk.Tk):
         self.refresh_list()
 
     def refresh_list(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        for m in self.library.get_all_movies():
-            rating_str = "" if m.rating is None else str(m.rating)
-            watched_str = "Yes" if m.watched else "No"
-            self.tree.insert("", tk.END, values=(m.title, m.year, m.genre, rating_str, watched_str))
+        # A single delete call clears every row in one Tcl round-trip.
+        self.tree.delete(*self.tree.get_children())
+
+        rows = [
+            (m.title, m.year, m.genre,
+             "" if m.rating is None else str(m.rating),
+             "Yes" if m.watched else "No")
+            for m in self.library.get_all_movies()
+        ]
+        for values in rows:
+            self.tree.insert("", tk.END, values=values)
 
 
 # ------------------------------ MAIN ENTRY POINT ------------------------------
@@ -371,5 +555,5 @@ class MovieLogApp(tk.Tk):
 if __name__ == "__main__":
     my_library = MovieLibrary()
     my_library.load_from_csv("movies.csv")
-    app = MovieLogApp(api_key="9763440c")
+    app = MovieLogApp(api_key="9763440c", library=my_library)
     app.mainloop()